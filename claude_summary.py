@@ -1,31 +1,43 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
+import orjson
 from anthropic import AsyncAnthropic, APIError
 
 from config import ClaudeSettings
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are a meticulous commodities strategist. "
+    "Summaries must stay factual, reference price levels explicitly, "
+    "and highlight support/resistance confluence and actionable trade plans."
+)
+
 
 class ClaudeSummaryService:
+    # Returned as-is whenever no API key is configured
+    _PLACEHOLDER: Mapping[str, Any] = MappingProxyType(
+        {
+            "status": "placeholder",
+            "headline": "Claude summary unavailable",
+            "body": (
+                "Set CLAUDE_API_KEY to unlock real-time AI commentary. "
+                "The rest of the dashboard continues to refresh normally."
+            ),
+        }
+    )
+
     def __init__(self, settings: ClaudeSettings) -> None:
         self.settings = settings
         self.client = AsyncAnthropic(api_key=settings.api_key) if settings.api_key else None
 
-    async def summarize(self, market_snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    async def summarize(self, market_snapshot: Dict[str, Any]) -> Mapping[str, Any]:
         if not self.client:
-            return {
-                "status": "placeholder",
-                "headline": "Claude summary unavailable",
-                "body": (
-                    "Set CLAUDE_API_KEY to unlock real-time AI commentary. "
-                    "The rest of the dashboard continues to refresh normally."
-                ),
-            }
+            return self._PLACEHOLDER
 
         content = self._build_prompt(market_snapshot)
         try:
@@ -33,11 +45,7 @@ class ClaudeSummaryService:
                 model=self.settings.model,
                 max_tokens=self.settings.max_tokens,
                 temperature=self.settings.temperature,
-                system=(
-                    "You are a meticulous commodities strategist. "
-                    "Summaries must stay factual, reference price levels explicitly, "
-                    "and highlight support/resistance confluence and actionable trade plans."
-                ),
+                system=SYSTEM_PROMPT,
                 messages=[
                     {
                         "role": "user",
@@ -45,12 +53,12 @@ class ClaudeSummaryService:
                     }
                 ],
             )
-            text = response.content[0].text if response.content else "No response from Claude."
+            try:
+                text = response.content[0].text
+            except (IndexError, AttributeError):
+                text = "No response from Claude."
             # Extract first 2-3 sentences
-            sentences = text.strip().split('. ')
-            summary_text = '. '.join(sentences[:3])
-            if len(sentences) > 3:
-                summary_text += '.'
+            summary_text = self._first_sentences(text, 3)
             
             return {
                 "status": "ok",
@@ -65,9 +73,24 @@ class ClaudeSummaryService:
                 "body": f"Claude could not generate a summary: {exc}",
             }
 
+    @staticmethod
+    def _first_sentences(text: str, count: int) -> str:
+        """Cut text after its `count`-th ". " without splitting the whole string"""
+        stripped = text.strip()
+        pos = -2
+        for _ in range(count):
+            pos = stripped.find(". ", pos + 2)
+            if pos < 0:
+                return stripped
+        return stripped[:pos + 1]
+
     @staticmethod
     def _build_prompt(snapshot: Dict[str, Any]) -> str:
-        compact = json.dumps(snapshot, default=str)
+        compact = orjson.dumps(
+            snapshot,
+            default=str,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
         return (
             "Using the JSON snapshot below, write a brief 2-3 sentence summary about the silver market.\n"
             "First sentence: Current price and short-term trend.\n"
@@ -26,7 +26,7 @@ TIMEFRAME_CONFIG = {
 }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClaudeSettings:
     api_key: str | None = os.getenv("CLAUDE_API_KEY")
     # Anthropic Claude API model names require date suffix
@@ -37,11 +37,13 @@ class ClaudeSettings:
     max_tokens: int = int(os.getenv("CLAUDE_MAX_TOKENS", "200"))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppSettings:
     refresh_seconds: int = int(os.getenv("REFRESH_SECONDS", "60"))
     frontend_url: str | None = os.getenv("FRONTEND_URL")
     environment: str = os.getenv("ENVIRONMENT", "development")
+    # Worker processes for per-timeframe analysis; 0 keeps it on a thread pool
+    analysis_workers: int = int(os.getenv("ANALYSIS_WORKERS", "0"))
     claude: ClaudeSettings = field(default_factory=ClaudeSettings)
 
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import logging
 import re
+import time
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -12,20 +15,103 @@ import numpy as np
 import pandas as pd
 import yfinance as yf
 
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 
-from config import SILVER_YFINANCE_SYMBOL, SILVER_SPOT_SYMBOL
+try:
+    import re2 as _fast_re
+except ImportError:  # google-re2 is optional; stdlib re yields the same matches
+    _fast_re = re
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; history generation falls back to NumPy
+    njit = None
+
+from config import SILVER_YFINANCE_SYMBOL, SILVER_SPOT_SYMBOL, get_settings
 
 logger = logging.getLogger(__name__)
 
 
 PRICE_PATTERN = re.compile(r"\$?\s?([0-9]{1,4}\.[0-9]{1,2})")
 
+# Next.js price patterns in priority order. Each is searched on its own:
+# folded into one alternation, a lower-priority match (e.g. "silver price
+# 30.00" or "$30.00") consumes the text of a USD hit and non-overlapping
+# scans never see it.
+_PRICE_PATTERNS = tuple(
+    _fast_re.compile(pattern)
+    for pattern in (
+        r"(?i)(\d{1,2}\.\d{2})\s*(?:USD|per ounce|oz|ounce)",
+        r"(?i)silver.*?price.*?(\d{1,2}\.\d{2})",
+        r"(?i)(\d{1,2}\.\d{2})\s*USD.*?silver",
+        r"\$(\d{1,2}\.\d{2})",
+        r"\b([4-5][0-9]\.\d{2})\b",
+    )
+)
+_CHANGE_RE = re.compile(r"([+\-]\d+\.\d{2})(?!%)")
+_CHANGE_PCT_RE = re.compile(r"([+\-]\d+\.\d{2})%")
+
+# Characters either side of a price match that are searched for keywords
+KEYWORD_WINDOW = 80
+
 
 # Primary source - matches Next.js implementation
 SILVERPRICE_URL = "https://silverprice.org/silver-price-per-ounce.html"
 METALS_LIVE_API = "https://api.metals.live/v1/spot/silver"
 
+# silverprice.org is streamed and abandoned once the price and both change
+# values are found; these bound the download and the overlap rescanned
+# across chunk boundaries.
+SILVERPRICE_MAX_BYTES = 256 * 1024
+SILVERPRICE_SCAN_OVERLAP = 512
+
+# Response validators and the request headers that send them back
+_CONDITIONAL_HEADERS = (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
+
+# Period -> days and interval -> hours used to size synthetic history
+_PERIOD_DAYS = MappingProxyType({"7d": 7, "1mo": 30, "3mo": 90, "6mo": 180, "1y": 365, "2y": 730})
+_INTERVAL_HOURS = MappingProxyType({"15m": 0.25, "1h": 1, "4h": 4, "1d": 24, "1wk": 168})
+
+# Shared generator for synthetic history; NumPy bit generators are
+# lock-protected, so concurrent to_thread callers can draw from it.
+_RNG = np.random.default_rng()
+
+# Reference price used to generate history while the spot fetch is in flight;
+# the generated series is rescaled to the real spot once it arrives.
+HISTORY_REFERENCE_PRICE = 48.24
+
+
+def _keyword_spans(lowered: str, keywords: tuple[str, ...]) -> List[tuple[int, int]]:
+    """Return sorted (start, end) spans of every keyword occurrence"""
+    keywords = tuple(keyword for keyword in keywords if keyword)
+    if not keywords:
+        return []
+    spans: List[tuple[int, int]] = []
+    for keyword in keywords:
+        start = lowered.find(keyword)
+        while start != -1:
+            spans.append((start, start + len(keyword)))
+            start = lowered.find(keyword, start + 1)
+    spans.sort()
+    return spans
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _fill_ohlcv(base, current, points, out_price, out_high, out_low, out_vol, seed):
+        np.random.seed(seed)
+        for j in range(points + 1):
+            variation = (np.random.random() - 0.5) * 2  # -1 to +1
+            price = base + (current - base) * (j / points) + variation
+            out_price[j] = price
+            out_high[j] = price * (1 + np.random.random() * 0.02)
+            out_low[j] = price * (1 - np.random.random() * 0.02)
+            out_vol[j] = np.random.random() * 2000000 + 1000000
+
+else:
+    _fill_ohlcv = None
+
 
 @dataclass
 class SpotPrice:
@@ -45,8 +131,45 @@ class SilverMarketDataService:
                 " Chrome/129.0.0.0 Safari/537.36"
             )
         }
+        # One pooled client for all scrapes so TLS sessions stay warm across refreshes
+        self._http = httpx.AsyncClient(
+            headers=self._client_headers,
+            http2=True,
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30),
+        )
+        # Validators and parsed result of the last silverprice.org page, so the
+        # next fetch can be a conditional GET answered with a 304
+        self._silverprice_validators: Dict[str, str] = {}
+        self._silverprice_result: Optional[Dict[str, float]] = None
+        self._spot_cache: Optional[Dict[str, Any]] = None
+        self._spot_expiry: float = 0.0
+        self._spot_task: Optional[asyncio.Task] = None
+        self._spot_lock = asyncio.Lock()
+        self._spot_ttl = get_settings().refresh_seconds
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        await self._http.aclose()
 
     async def fetch_spot_prices(self) -> Dict[str, Any]:
+        """Fetch spot prices, sharing one in-flight fetch and reusing it for refresh_seconds"""
+        async with self._spot_lock:
+            if self._spot_cache and time.monotonic() < self._spot_expiry:
+                return dict(self._spot_cache)
+            if self._spot_task is None or self._spot_task.done():
+                self._spot_task = asyncio.create_task(self._refresh_spot_prices())
+            task = self._spot_task
+        # Shield so a cancelled caller does not cancel the fetch other callers await
+        return dict(await asyncio.shield(task))
+
+    async def _refresh_spot_prices(self) -> Dict[str, Any]:
+        spot_data = await self._fetch_spot_prices()
+        self._spot_cache = spot_data
+        self._spot_expiry = time.monotonic() + self._spot_ttl
+        return spot_data
+
+    async def _fetch_spot_prices(self) -> Dict[str, Any]:
         """Fetch spot prices using the exact same logic as the Next.js implementation"""
         # Try silverprice.org first with timeout (exact match to Next.js)
         try:
@@ -63,7 +186,8 @@ class SilverMarketDataService:
                 logger.warning("⚠️ metals.live API timeout")
                 result = None
         
-        if not result:
+        is_fallback = not result
+        if is_fallback:
             # Ultimate fallback (exact match to Next.js)
             logger.warning("⚠️ All sources failed, using fallback price")
             result = {"price": 48.24, "change": 0.03, "changePercent": 0.06}
@@ -76,6 +200,7 @@ class SilverMarketDataService:
             "average": result["price"],
             "change": result.get("change", 0.0),
             "changePercent": result.get("changePercent", 0.0),
+            "isFallback": is_fallback,
         }
         
         logger.info("✅ Silver price fetched: $%.2f (change: %.2f%%)", result["price"], result.get("changePercent", 0))
@@ -84,46 +209,59 @@ class SilverMarketDataService:
     async def _fetch_silverprice_org(self) -> Optional[Dict[str, float]]:
         """Fetch from silverprice.org using exact Next.js regex patterns"""
         try:
-            # Use shorter timeout to avoid hanging
-            async with httpx.AsyncClient(headers=self._client_headers, timeout=5.0) as client:
-                resp = await client.get(SILVERPRICE_URL)
+            buffer = bytearray()
+            # First USD-pattern hit on the page: None until seen, then whether it is a valid price
+            usd_price_ok: Optional[bool] = None
+            has_change = has_change_pct = False
+            headers = self._silverprice_validators if self._silverprice_result else {}
+            async with self._http.stream("GET", SILVERPRICE_URL, headers=headers) as resp:
+                if resp.status_code == 304 and self._silverprice_result:
+                    logger.info("✅ silverprice.org unchanged (304): $%.2f", self._silverprice_result["price"])
+                    return dict(self._silverprice_result)
                 resp.raise_for_status()
-                html = resp.text
-                
-                # Pattern 1: Look for price patterns like "48.24" near "USD" or "oz" (exact Next.js patterns)
-                import re
-                price_match = (
-                    re.search(r"(\d{1,2}\.\d{2})\s*(?:USD|per ounce|oz|ounce)", html, re.IGNORECASE) or
-                    re.search(r"silver.*?price.*?(\d{1,2}\.\d{2})", html, re.IGNORECASE) or
-                    re.search(r"(\d{1,2}\.\d{2})\s*USD.*?silver", html, re.IGNORECASE) or
-                    re.search(r"\$(\d{1,2}\.\d{2})", html)
-                )
-                
-                # Pattern 2: Look for numbers in 40-60 range (exact Next.js pattern)
-                if not price_match:
-                    all_prices = re.findall(r"\b([4-5][0-9]\.\d{2})\b", html)
-                    if all_prices:
-                        # Create a match-like object
-                        class MatchObj:
-                            def group(self, n):
-                                return re.sub(r'[^\d.]', '', all_prices[0])
-                        price_match = MatchObj()
-                
-                # Extract change values (exact Next.js patterns)
-                change_match = re.search(r"([+\-]\d+\.\d{2})(?!%)", html)
-                change_percent_match = re.search(r"([+\-]\d+\.\d{2})%", html)
-                
-                if price_match:
-                    price = float(price_match.group(1))
-                    if 15 <= price <= 100:  # Validate range (exact Next.js validation)
-                        change = float(change_match.group(1)) if change_match else 0.03
-                        change_percent = float(change_percent_match.group(1)) if change_percent_match else 0.06
-                        logger.info("✅ Scraped silverprice.org: $%.2f", price)
-                        return {"price": price, "change": change, "changePercent": change_percent}
-                
-                logger.warning("⚠️ Could not parse price from silverprice.org HTML")
-                return None
-                
+                validators = {
+                    request_header: resp.headers[response_header]
+                    for response_header, request_header in _CONDITIONAL_HEADERS
+                    if response_header in resp.headers
+                }
+                encoding = resp.encoding or "utf-8"
+                async for chunk in resp.aiter_bytes():
+                    buffer.extend(chunk)
+                    # Stop downloading once the top-priority price and both
+                    # change values have been seen; the page prints them apart
+                    tail = bytes(buffer[-(len(chunk) + SILVERPRICE_SCAN_OVERLAP):])
+                    text = tail.decode(encoding, errors="ignore")
+                    if usd_price_ok is None:
+                        match = _PRICE_PATTERNS[0].search(text)
+                        if match:
+                            usd_price_ok = 15 <= float(match.group(1)) <= 100
+                    has_change = has_change or self._settled_match(_CHANGE_RE, text)
+                    has_change_pct = has_change_pct or self._settled_match(_CHANGE_PCT_RE, text)
+                    if (usd_price_ok and has_change and has_change_pct) or len(buffer) >= SILVERPRICE_MAX_BYTES:
+                        break
+            html = buffer.decode(encoding, errors="ignore")
+            
+            # Look for price patterns like "48.24" near "USD" or "oz" (exact Next.js patterns)
+            price = self._match_price(html)
+            
+            # Extract change values (exact Next.js patterns)
+            change_match = _CHANGE_RE.search(html)
+            change_percent_match = _CHANGE_PCT_RE.search(html)
+            
+            if price:
+                change = float(change_match.group(1)) if change_match else 0.03
+                change_percent = float(change_percent_match.group(1)) if change_percent_match else 0.06
+                logger.info("✅ Scraped silverprice.org: $%.2f", price)
+                result = {"price": price, "change": change, "changePercent": change_percent}
+                self._silverprice_validators = validators
+                self._silverprice_result = result
+                return dict(result)
+            
+            logger.warning("⚠️ Could not parse price from silverprice.org HTML")
+            self._silverprice_validators = {}
+            self._silverprice_result = None
+            return None
+            
         except Exception as exc:
             logger.error("❌ Error fetching from silverprice.org: %s", exc)
             return None
@@ -131,76 +269,93 @@ class SilverMarketDataService:
     async def _fetch_metals_live_api(self) -> Optional[Dict[str, float]]:
         """Fallback to metals.live API (exact Next.js fallback)"""
         try:
-            async with httpx.AsyncClient(headers=self._client_headers, timeout=10) as client:
-                resp = await client.get(METALS_LIVE_API)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    price = data.get("price") or data.get("rate") or 48.24
-                    change = data.get("change", 0.03)
-                    change_percent = data.get("changePercent", 0.06)
-                    logger.info("✅ Metals.live API: $%.2f", price)
-                    return {"price": float(price), "change": float(change), "changePercent": float(change_percent)}
+            resp = await self._http.get(METALS_LIVE_API)
+            if resp.status_code == 200:
+                data = resp.json()
+                price = data.get("price") or data.get("rate") or 48.24
+                change = data.get("change", 0.03)
+                change_percent = data.get("changePercent", 0.06)
+                logger.info("✅ Metals.live API: $%.2f", price)
+                return {"price": float(price), "change": float(change), "changePercent": float(change_percent)}
         except Exception as exc:
             logger.debug("Metals.live API failed: %s", exc)
         return None
 
     async def get_historical_dataframe(self, interval: str, period: str) -> pd.DataFrame:
         """Get historical data - generates realistic data like Next.js implementation"""
-        # Get current price first
-        spot_data = await self.fetch_spot_prices()
-        current_price = spot_data.get("average", 48.24)
-        
-        # Generate historical data with realistic variation (exact Next.js logic)
-        return await asyncio.to_thread(self._generate_historical_data, current_price, interval, period)
+        # Fetch the spot price and generate the series concurrently, then
+        # rescale the series from the reference price to the live price.
+        spot_task = asyncio.create_task(self.fetch_spot_prices())
+        hist_task = asyncio.to_thread(
+            self._generate_historical_data, HISTORY_REFERENCE_PRICE, interval, period
+        )
+        spot_data, df = await asyncio.gather(spot_task, hist_task)
+        current_price = spot_data.get("average", HISTORY_REFERENCE_PRICE)
+
+        scale = current_price / HISTORY_REFERENCE_PRICE
+        if scale != 1.0:
+            ohlc = ["open", "high", "low", "close"]
+            df[ohlc] = df[ohlc] * scale
+        # Live spot the series was scaled to; None when it rests on the fallback price
+        live = "average" in spot_data and not spot_data.get("isFallback", False)
+        df.attrs["spot"] = round(current_price, 2) if live else None
+        return df
     
     @staticmethod
     def _generate_historical_data(current_price: float, interval: str, period: str) -> pd.DataFrame:
-        """Generate historical data matching Next.js implementation"""
-        import random
-        from datetime import datetime, timedelta
-        
+        """Generate historical data following the Next.js implementation"""
         # Parse period to days
-        period_days = {
-            "7d": 7, "1mo": 30, "3mo": 90, "6mo": 180, "1y": 365, "2y": 730
-        }.get(period, 365)
+        period_days = _PERIOD_DAYS.get(period, 365)
         
         # Determine interval in hours
-        interval_hours = {
-            "15m": 0.25, "1h": 1, "4h": 4, "1d": 24, "1wk": 168
-        }.get(interval, 24)
+        interval_hours = _INTERVAL_HOURS.get(interval, 24)
         
         # Calculate number of points
         is_hourly = interval_hours < 24
         points = min(period_days * (24 if is_hourly else 1), 1000)
         interval_ms = int(interval_hours * 60 * 60 * 1000)
+        size = points + 1
         
-        # Generate timestamps and prices (exact Next.js logic)
-        now = datetime.now()
+        # Next.js trend-plus-noise walk, without its $20-$60 clamp: the series is
+        # generated at the reference price and rescaled to the live spot, so a
+        # clamp here would never fire and one after rescaling would flatten it
         base_price = current_price * 0.85  # Start lower for historical trend
         
-        timestamps = []
-        prices = []
-        volumes = []
+        # Column-major so each OHLCV column is contiguous and pandas can
+        # adopt the buffer as a single float64 block without copying.
+        data = np.empty((size, 5), dtype=np.float64, order="F")
+        opens, highs, lows, closes, volumes = (data[:, col] for col in range(5))
         
-        for i in range(points, -1, -1):
-            timestamp = now - timedelta(milliseconds=i * interval_ms)
-            trend_factor = (points - i) / points  # 0 to 1
-            variation = (random.random() - 0.5) * 2  # -1 to +1
-            price = base_price + (current_price - base_price) * trend_factor + variation
-            price = max(20, min(60, price))  # Clamp between $20-$60
-            
-            timestamps.append(timestamp)
-            prices.append(price)
-            volumes.append(random.random() * 2000000 + 1000000)
+        if _fill_ohlcv is not None:
+            seed = int(_RNG.integers(0, 2**31 - 1))
+            _fill_ohlcv(base_price, current_price, points, closes, highs, lows, volumes, seed)
+        else:
+            draws = _RNG.random((4, size))  # All random draws in one call
+            trend_factor = np.arange(size) / points  # 0 to 1
+            variation = (draws[0] - 0.5) * 2  # -1 to +1
+            np.add(base_price + (current_price - base_price) * trend_factor, variation, out=closes)
+            np.multiply(closes, 1 + draws[1] * 0.02, out=highs)
+            np.multiply(closes, 1 - draws[2] * 0.02, out=lows)
+            np.multiply(draws[3], 2000000, out=volumes)
+            volumes += 1000000
+        opens[:] = closes
+        
+        # Build the whole index in one C-level pass ending at the open of the
+        # current bar, so the last timestamp only moves when a new bar starts
+        freq = pd.Timedelta(milliseconds=interval_ms)
+        timestamps = pd.date_range(
+            end=pd.Timestamp.now().floor(freq),
+            periods=size,
+            freq=freq,
+        )
         
         # Create DataFrame
-        df = pd.DataFrame({
-            "open": prices,
-            "high": [p * (1 + random.random() * 0.02) for p in prices],
-            "low": [p * (1 - random.random() * 0.02) for p in prices],
-            "close": prices,
-            "volume": volumes,
-        }, index=pd.DatetimeIndex(timestamps))
+        df = pd.DataFrame(
+            data,
+            columns=["open", "high", "low", "close", "volume"],
+            index=timestamps,
+            copy=False,
+        )
         
         return df
 
@@ -228,20 +383,20 @@ class SilverMarketDataService:
                     logger.info("✅ Scraped %s: $%.2f", target["name"], price)
                     return SpotPrice(source=target["name"], price=price)
             
-            # For other sites, try BeautifulSoup parsing first
-            soup = BeautifulSoup(html, "html.parser")
+            # For other sites, try DOM parsing first
+            tree = HTMLParser(html)
             
             # Look for elements with class/id containing "price"
-            for elem in soup.find_all(attrs={"class": lambda x: x and ("price" in str(x).lower() or "spot" in str(x).lower())}):
-                text = elem.get_text(" ", strip=True)
+            for elem in tree.css('[class*="price"], [class*="spot"], [id*="price"]'):
+                text = elem.text(separator=" ", strip=True)
                 price = self._extract_price(text, target["keywords"])
                 if price:
                     logger.info("✅ Scraped %s: $%.2f", target["name"], price)
                     return SpotPrice(source=target["name"], price=price)
             
             # Look for large numbers that could be prices
-            for tag in soup.find_all(["span", "div", "h1", "h2", "h3", "strong", "b"]):
-                text = tag.get_text(" ", strip=True)
+            for tag in tree.css("span, div, h1, h2, h3, strong, b"):
+                text = tag.text(separator=" ", strip=True)
                 if any(kw in text.lower() for kw in target["keywords"]):
                     price = self._extract_price(text, target["keywords"])
                     if price:
@@ -263,45 +418,40 @@ class SilverMarketDataService:
             logger.error("❌ Failed to scrape %s: %s", target["name"], exc)
             return None
 
+    @staticmethod
+    def _match_price(blob: str) -> Optional[float]:
+        """Return the first hit of the highest-priority pattern whose first hit is in [15, 100]"""
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(blob)
+            if match:
+                price = float(match.group(1))
+                if 15 <= price <= 100:  # Sanity check
+                    return price
+        return None
+
+    @staticmethod
+    def _settled_match(pattern: re.Pattern[str], text: str) -> bool:
+        """True if `pattern` matches with text after it, so more input cannot change the match"""
+        match = pattern.search(text)
+        return match is not None and match.end() < len(text)
+
     @staticmethod
     def _extract_price(blob: str, keywords: List[str]) -> Optional[float]:
-        import re
-        
         lowered = blob.lower()
         
         # Multiple regex patterns (like the Next.js version)
-        # Pattern 1: Look for price patterns like "48.24" near "USD" or "oz"
-        patterns = [
-            r"(\d{1,2}\.\d{2})\s*(?:USD|per ounce|oz|ounce)",
-            r"silver.*?price.*?(\d{1,2}\.\d{2})",
-            r"(\d{1,2}\.\d{2})\s*USD.*?silver",
-            r"\$(\d{1,2}\.\d{2})",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, blob, re.IGNORECASE)
-            if match:
-                try:
-                    price = float(match.group(1))
-                    if 15 <= price <= 100:  # Sanity check
-                        return price
-                except (ValueError, IndexError):
-                    continue
-        
-        # Pattern 2: Look for numbers in the 40-60 range (typical silver prices)
-        all_prices = re.findall(r"\b([4-5][0-9]\.\d{2})\b", blob)
-        if all_prices:
-            try:
-                price = float(all_prices[0])
-                if 15 <= price <= 100:
-                    return price
-            except ValueError:
-                pass
+        price = SilverMarketDataService._match_price(blob)
+        if price:
+            return price
         
-        # Fallback: original pattern matching
+        # Fallback: original pattern matching, with keyword hits located once up front
+        spans = _keyword_spans(lowered, tuple(keyword.lower() for keyword in keywords))
+        starts = [start for start, _ in spans]
         for match in PRICE_PATTERN.finditer(blob):
-            window = lowered[max(0, match.start() - 80): match.end() + 80]
-            if any(keyword in window for keyword in keywords):
+            lo = max(0, match.start() - KEYWORD_WINDOW)
+            hi = match.end() + KEYWORD_WINDOW
+            idx = bisect_left(starts, lo)
+            if any(end <= hi for _, end in spans[idx:bisect_left(starts, hi)]):
                 try:
                     price = float(match.group(1))
                     if 15 <= price <= 100:
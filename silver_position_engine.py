@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import logging
+import math
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -13,7 +19,271 @@ from ta.volatility import BollingerBands, AverageTrueRange
 
 from config import TIMEFRAME_CONFIG
 from silver_data_sources import SilverMarketDataService
-from technical_levels import LevelSet, build_trade_plan, classify_trend, detect_levels
+from technical_levels import LevelSet, TradePlan, build_trade_plan, classify_trend, detect_levels
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; indicators fall back to the ta library
+    njit = None
+
+
+# Column order written by the fused indicator kernel
+_KERNEL_COLUMNS = (
+    "ema_12", "ema_26", "sma_50", "sma_200", "macd", "macd_signal", "rsi",
+    "stoch_k", "adx", "bb_upper", "bb_lower", "bb_middle", "atr", "volume_ratio",
+)
+
+# Rows before SMA 200's first value; every indicator is defined from here on
+_WARMUP_ROWS = 199
+
+# Indicators that can still be NaN after the warm-up: %K on a flat 14-bar
+# range, and the volume ratio while leading bars have no traded volume
+_SPARSE_COLUMNS = ["stoch_k", "volume_ratio"]
+
+# Latest indicator values reported in each position's snapshot
+_SNAPSHOT_COLUMNS = (
+    "ema_12", "ema_26", "sma_50", "sma_200", "rsi", "macd", "macd_signal", "stoch_k",
+    "bb_upper", "bb_middle", "bb_lower", "atr", "adx", "volume_ratio",
+)
+
+# Series sent to the frontend chart, in payload order
+_CHART_COLUMNS = (
+    "close", "high", "low", "volume", "ema_12", "ema_26", "sma_50", "bb_upper", "bb_lower",
+)
+
+# Reason texts reported by _score, indexed by the _R_* codes below
+_REASONS = (
+    "✅ Fast EMA trending above slow EMA.",
+    "❌ Fast EMA below slow EMA.",
+    "✅ Price trading above 50 SMA.",
+    "❌ Price below 50 SMA.",
+    "✅ MACD line above signal line.",
+    "❌ MACD line below signal line.",
+    "⚠️ RSI in neutral zone.",
+    "✅ RSI momentum bullish.",
+    "❌ RSI momentum bearish.",
+    "✅ Trend strength (ADX) above 25.",
+    "✅ Price inside Bollinger bands.",
+    "⚠️ Price outside Bollinger bands.",
+    "✅ Attractive risk-reward profile.",
+    "⚠️ Risk-reward below ideal threshold.",
+)
+(
+    _R_EMA_UP, _R_EMA_DOWN, _R_ABOVE_SMA50, _R_BELOW_SMA50, _R_MACD_UP, _R_MACD_DOWN,
+    _R_RSI_NEUTRAL, _R_RSI_BULL, _R_RSI_BEAR, _R_ADX_STRONG, _R_INSIDE_BB, _R_OUTSIDE_BB,
+    _R_RR_GOOD, _R_RR_POOR,
+) = range(len(_REASONS))
+
+# Score bands: bisect_right(_SCORE_THRESHOLDS, score) indexes _SCORE_LABELS
+_SCORE_THRESHOLDS = (-7, -4, -2, 2, 5, 8)
+_SCORE_LABELS = (
+    ("🔴 STRONG SELL", "SELL", "High"),
+    ("🔴 SELL", "SELL", "Medium"),
+    ("🟠 WEAK SELL", "SELL", "Medium"),
+    ("⚪ HOLD / WAIT", "HOLD", "Balanced"),
+    ("🟡 WEAK BUY", "BUY", "Medium"),
+    ("🟢 BUY", "BUY", "Medium"),
+    ("🟢 STRONG BUY", "BUY", "High"),
+)
+
+# RSI sentiment bands; the fear side is inclusive (rsi <= 30, rsi <= 40),
+# so those thresholds sit one ulp above the boundary
+_SENTIMENT_THRESHOLDS = (math.nextafter(30.0, math.inf), math.nextafter(40.0, math.inf), 60.0, 70.0)
+_SENTIMENT_LABELS = ("Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed")
+
+
+if njit is not None:
+
+    # No fastmath: warm-up rows are NaN and must stay NaN like the ta output.
+    @njit(cache=True, error_model="numpy")
+    def _indicator_kernel(close, high, low, volume, out):
+        """Fill `out` with every indicator in one compiled pass, matching ta's formulas"""
+        n = close.shape[0]
+        out[:, :] = np.nan
+        a12 = 2.0 / 13.0
+        a26 = 2.0 / 27.0
+        a9 = 2.0 / 10.0
+        a14 = 1.0 / 14.0
+        w = 14
+
+        ema12 = close[0]
+        ema26 = close[0]
+        signal = 0.0
+        avg_up = 0.0
+        avg_dn = 0.0
+        sum50 = 0.0
+        sum200 = 0.0
+        atr = 0.0
+        tr_sum = 0.0
+        # ADX smoothing state (ta's Wilder-style sums, seeded from bars 1..14)
+        trs = 0.0
+        dip = 0.0
+        din = 0.0
+        dx_sum = 0.0
+        adx = 0.0
+        # Volume: zeros carry the last traded volume forward. The 20-bar mean uses
+        # pandas' compensated rolling sum so the ratio matches it bit for bit.
+        vol_window = np.empty(20)
+        last_vol = np.nan
+        vol_sum = 0.0
+        vol_comp_add = 0.0
+        vol_comp_remove = 0.0
+        vol_obs = 0
+        same_run = 0
+        same_val = np.nan
+
+        for i in range(n):
+            c = close[i]
+            h = high[i]
+            lo = low[i]
+
+            # EMA 12/26 and MACD (span EMAs, adjust=False)
+            if i > 0:
+                ema12 = ema12 + a12 * (c - ema12)
+                ema26 = ema26 + a26 * (c - ema26)
+            if i >= 11:
+                out[i, 0] = ema12
+            if i >= 25:
+                macd = ema12 - ema26
+                out[i, 1] = ema26
+                out[i, 4] = macd
+                signal = macd if i == 25 else signal + a9 * (macd - signal)
+                if i >= 33:
+                    out[i, 5] = signal
+
+            # SMA 50/200 via running sums
+            sum50 += c
+            sum200 += c
+            if i >= 50:
+                sum50 -= close[i - 50]
+            if i >= 200:
+                sum200 -= close[i - 200]
+            if i >= 49:
+                out[i, 2] = sum50 / 50.0
+            if i >= 199:
+                out[i, 3] = sum200 / 200.0
+
+            # RSI 14 (Wilder smoothing, alpha = 1/14)
+            if i > 0:
+                diff = c - close[i - 1]
+                up = diff if diff > 0 else 0.0
+                dn = -diff if diff < 0 else 0.0
+                avg_up = avg_up + a14 * (up - avg_up)
+                avg_dn = avg_dn + a14 * (dn - avg_dn)
+            if i >= 13:
+                out[i, 6] = 100.0 if avg_dn == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_dn)
+
+            # Stochastic %K 14
+            if i >= 13:
+                lowest = low[i]
+                highest = high[i]
+                for j in range(i - 13, i):
+                    lowest = min(lowest, low[j])
+                    highest = max(highest, high[j])
+                out[i, 7] = 100.0 * (c - lowest) / (highest - lowest)
+
+            # Bollinger bands 20 / 2 (population std)
+            if i >= 19:
+                mean = 0.0
+                for j in range(i - 19, i + 1):
+                    mean += close[j]
+                mean /= 20.0
+                var = 0.0
+                for j in range(i - 19, i + 1):
+                    var += (close[j] - mean) ** 2
+                std = np.sqrt(var / 20.0)
+                out[i, 9] = mean + 2.0 * std
+                out[i, 10] = mean - 2.0 * std
+                out[i, 11] = mean
+
+            # ATR 14 (zeros before the seed bar, as ta returns)
+            if i == 0:
+                tr = h - lo
+            else:
+                prev = close[i - 1]
+                tr = max(h - lo, abs(h - prev), abs(lo - prev))
+            if i < w:
+                tr_sum += tr
+                atr = tr_sum / w if i == w - 1 else 0.0
+            else:
+                atr = (atr * (w - 1) + tr) / w
+            out[i, 12] = atr
+
+            # Volume ratio against the 20-bar mean of the forward-filled volume
+            v = volume[i]
+            if v == 0 or np.isnan(v):
+                v = last_vol
+            if i >= 20:
+                old = vol_window[i % 20]
+                if not np.isnan(old):
+                    vol_obs -= 1
+                    y = -old - vol_comp_remove
+                    t = vol_sum + y
+                    vol_comp_remove = t - vol_sum - y
+                    vol_sum = t
+            if not np.isnan(v):
+                vol_obs += 1
+                y = v - vol_comp_add
+                t = vol_sum + y
+                vol_comp_add = t - vol_sum - y
+                vol_sum = t
+                same_run = same_run + 1 if v == same_val else 1
+                same_val = v
+            vol_window[i % 20] = v
+            last_vol = v
+            if i >= 19 and vol_obs == 20:
+                mean = same_val if same_run >= 20 else vol_sum / 20.0
+                out[i, 13] = v / mean
+
+        # ADX 14, following ta's index layout: smoothed sums start at bar 14,
+        # DX index k maps to bar k + 13, and the last smoothed slot stays zero.
+        length = n - (w - 1)
+        out[:, 8] = 0.0
+        if length <= w:
+            return
+        dx_prev = 0.0
+        for k in range(length):
+            if k == 0:
+                trs = 0.0
+                dip = 0.0
+                din = 0.0
+                for j in range(1, w + 1):
+                    prev = close[j - 1]
+                    trs += max(high[j], prev) - min(low[j], prev)
+                    up = high[j] - high[j - 1]
+                    down = low[j - 1] - low[j]
+                    dip += up if (up > down and up > 0) else 0.0
+                    din += down if (down > up and down > 0) else 0.0
+            elif k < length - 1:
+                j = w + k
+                prev = close[j - 1]
+                up = high[j] - high[j - 1]
+                down = low[j - 1] - low[j]
+                trs = trs - trs / w + (max(high[j], prev) - min(low[j], prev))
+                dip = dip - dip / w + (up if (up > down and up > 0) else 0.0)
+                din = din - din / w + (down if (down > up and down > 0) else 0.0)
+            else:
+                trs = 0.0
+                dip = 0.0
+                din = 0.0
+            pdi = 100.0 * dip / trs if trs != 0 else 0.0
+            ndi = 100.0 * din / trs if trs != 0 else 0.0
+            dx = 100.0 * abs((pdi - ndi) / (pdi + ndi)) if pdi + ndi != 0 else 0.0
+
+            if k < w:
+                dx_sum += dx
+            if k == w:
+                adx = dx_sum / w
+                out[k + w - 1, 8] = adx
+            elif k > w:
+                adx = (adx * (w - 1) + dx_prev) / w
+                out[k + w - 1, 8] = adx
+            dx_prev = dx
+
+else:
+    _indicator_kernel = None
 
 
 @dataclass
@@ -25,38 +295,124 @@ class Position:
 
 
 class SilverPositionEngine:
-    def __init__(self, market_service: SilverMarketDataService) -> None:
+    def __init__(self, market_service: SilverMarketDataService, workers: int = 0) -> None:
         self.market_service = market_service
+        # Worker processes for CPU-bound analysis; 0 uses the loop's default thread pool
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Last analysis per timeframe, keyed by the bar and live spot it was computed on
+        self._cache: Dict[str, Tuple[Tuple[pd.Timestamp, float], Dict[str, Any]]] = {}
+        self._timeframes = tuple(TIMEFRAME_CONFIG.items())
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            # Spawned workers so the pool never forks a process with a running event loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
     async def analyze_all(self) -> List[Dict[str, Any]]:
-        tasks = [
-            self._analyze_timeframe(tf, cfg)
-            for tf, cfg in TIMEFRAME_CONFIG.items()
+        # Fetch all timeframes concurrently and hand each frame to the executor as it arrives
+        fetches = [
+            asyncio.ensure_future(
+                self.market_service.get_historical_dataframe(interval=cfg["interval"], period=cfg["period"])
+            )
+            for _, cfg in self._timeframes
         ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        payloads: List[Dict[str, Any]] = []
-        for result in results:
-            if isinstance(result, dict):
-                payloads.append(result)
-        return payloads
-
-    async def _analyze_timeframe(self, timeframe: str, cfg: Dict[str, str]) -> Optional[Dict[str, Any]]:
-        df = await self.market_service.get_historical_dataframe(
-            interval=cfg["interval"],
-            period=cfg["period"],
-        )
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        payloads: Dict[str, Dict[str, Any]] = {}
+        jobs: Dict[str, Tuple[Optional[Tuple[pd.Timestamp, float]], asyncio.Future]] = {}
+        for (tf, cfg), fetch in zip(self._timeframes, fetches):
+            try:
+                df = await fetch
+            except Exception as exc:  # noqa: BLE001
+                logger.error("History fetch failed for %s: %s", tf, exc)
+                continue
+            if df.empty:
+                continue
+            cached = self._cached_payload(tf, df)
+            if cached is not None:
+                payloads[tf] = cached
+                continue
+            jobs[tf] = (self._cache_key(df), loop.run_in_executor(executor, self._analyze_frame, tf, cfg, df))
+
+        pool_broken = False
+        for tf, (key, job) in jobs.items():
+            try:
+                result = await job
+            except BrokenProcessPool as exc:
+                logger.error("Analysis failed for %s: %s", tf, exc)
+                pool_broken = True
+                continue
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Analysis failed for %s: %s", tf, exc)
+                continue
+            if result is not None:
+                if key is not None:
+                    self._cache[tf] = (key, result)
+                payloads[tf] = result
+        if pool_broken:
+            logger.warning("Analysis worker pool broke; it will be recreated on the next refresh")
+            self.shutdown()
+        return [payloads[tf] for tf, _ in self._timeframes if tf in payloads]
+
+    def _cached_payload(self, timeframe: str, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Reuse the previous analysis while no new bar has arrived, refreshing only the live fields"""
+        cached = self._cache.get(timeframe)
+        key = self._cache_key(df)
+        if cached is None or key is None or cached[0] != key:
+            return None
+        return {
+            **cached[1],
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "current_price": float(df["close"].iat[-1]),
+        }
+
+    @staticmethod
+    def _cache_key(df: pd.DataFrame) -> Optional[Tuple[pd.Timestamp, float]]:
+        """Last bar plus the live spot the history was scaled to; None when it must not be cached"""
+        spot = df.attrs.get("spot")
+        if spot is None:
+            return None
+        return df.index[-1], spot
+
+    @staticmethod
+    def _analyze_frame(timeframe: str, cfg: Dict[str, str], df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Pure CPU analysis of one timeframe; picklable so it can run in a worker process"""
         if df.empty or len(df) < 60:
             return None
 
-        indicators = self._compute_indicators(df.copy())
-        current_price = float(indicators["close"].iloc[-1])
+        indicators = SilverPositionEngine._compute_indicators(df)
+        if len(indicators) < 2:
+            # Too short to survive the indicator warm-up (SMA 200)
+            return None
+        # Read the last two rows once as plain floats for the scalar checks below
+        tail = indicators.iloc[-2:].to_numpy(dtype=np.float64)
+        last = dict(zip(indicators.columns, tail[-1].tolist()))
+        prev = dict(zip(indicators.columns, tail[-2].tolist()))
+        current_price = last["close"]
 
         levels = detect_levels(indicators)
         trade = build_trade_plan(current_price, levels)
-        score, recommendation, action, confidence, reasons = self._score(indicators, trade, timeframe)
-        risk_pct, reward_pct = self._risk_reward_pct(current_price, trade)
+        score, recommendation, action, confidence, reasons = SilverPositionEngine._score(last, trade, timeframe)
+        risk_pct, reward_pct = SilverPositionEngine._risk_reward_pct(current_price, trade)
+        take_profit_3 = levels.resistances[2] if len(levels.resistances) > 2 else None
+        entry, stop_loss, take_profit_1, take_profit_2, take_profit_3 = (
+            round(price, 3) if price else None
+            for price in (trade.entry, trade.stop_loss, trade.take_profit_1, trade.take_profit_2, take_profit_3)
+        )
 
-        chart_data = self._chart_payload(indicators)
+        chart_data = SilverPositionEngine._chart_payload(indicators)
 
         payload = {
             "timeframe": timeframe,
@@ -68,221 +424,200 @@ class SilverPositionEngine:
             "confidence": confidence,
             "score": score,
             "max_score": 20,
-            "entry": round(trade["entry"], 3) if trade["entry"] else None,
-            "stop_loss": round(trade["stop_loss"], 3) if trade["stop_loss"] else None,
-            "take_profit_1": round(trade["take_profit_1"], 3) if trade["take_profit_1"] else None,
-            "take_profit_2": round(trade["take_profit_2"], 3) if trade["take_profit_2"] else None,
-            "take_profit_3": round(levels.resistances[2], 3) if len(levels.resistances) > 2 else None,
+            "entry": entry,
+            "stop_loss": stop_loss,
+            "take_profit_1": take_profit_1,
+            "take_profit_2": take_profit_2,
+            "take_profit_3": take_profit_3,
             "risk_pct": risk_pct,
             "reward_pct": reward_pct,
-            "risk_reward_ratio": trade["risk_reward_ratio"] or 0,
-            "technical_indicators": self._indicator_snapshot(indicators),
+            "risk_reward_ratio": trade.risk_reward_ratio or 0,
+            "technical_indicators": SilverPositionEngine._indicator_snapshot(last, classify_trend(indicators)),
             "support_levels": levels.supports,
             "resistance_levels": levels.resistances,
             "reasons": reasons,
-            "technical_details": self._technical_details(indicators),
-            "fear_greed_value": min(100, max(0, round(indicators["rsi"].iloc[-1], 2))),
-            "fear_greed_classification": self._classify_sentiment(indicators["rsi"].iloc[-1]),
+            "technical_details": SilverPositionEngine._technical_details(last, prev),
+            "fear_greed_value": min(100, max(0, round(last["rsi"], 2))),
+            "fear_greed_classification": SilverPositionEngine._classify_sentiment(last["rsi"]),
             "chart_data": chart_data,
         }
         return payload
 
     @staticmethod
     def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+        """Return `df` joined with its indicator columns; `df` itself is left untouched"""
         close = df["close"]
         high = df["high"]
         low = df["low"]
-        volume = df["volume"].replace(0, np.nan).fillna(method="ffill")
-
-        df["ema_12"] = EMAIndicator(close=close, window=12).ema_indicator()
-        df["ema_26"] = EMAIndicator(close=close, window=26).ema_indicator()
-        df["sma_50"] = SMAIndicator(close=close, window=50).sma_indicator()
-        df["sma_200"] = SMAIndicator(close=close, window=200).sma_indicator()
-
-        macd = MACD(close=close, window_fast=12, window_slow=26, window_sign=9)
-        df["macd"] = macd.macd()
-        df["macd_signal"] = macd.macd_signal()
 
-        rsi = RSIIndicator(close=close, window=14)
-        df["rsi"] = rsi.rsi()
-
-        stoch = StochasticOscillator(high=high, low=low, close=close, window=14, smooth_window=3)
-        df["stoch_k"] = stoch.stoch()
-
-        adx = ADXIndicator(high=high, low=low, close=close, window=14)
-        df["adx"] = adx.adx()
-
-        bb = BollingerBands(close=close, window=20, window_dev=2)
-        df["bb_upper"] = bb.bollinger_hband()
-        df["bb_lower"] = bb.bollinger_lband()
-        df["bb_middle"] = bb.bollinger_mavg()
-
-        atr = AverageTrueRange(high=high, low=low, close=close, window=14)
-        df["atr"] = atr.average_true_range()
-
-        df["volume_ratio"] = volume / volume.rolling(window=20).mean()
-        df = df.dropna()
-        return df
+        if _indicator_kernel is not None:
+            # Column-major so pandas adopts the kernel output as one block without copying
+            out = np.empty((len(df), len(_KERNEL_COLUMNS)), order="F")
+            _indicator_kernel(
+                close.to_numpy(dtype=np.float64),
+                high.to_numpy(dtype=np.float64),
+                low.to_numpy(dtype=np.float64),
+                df["volume"].to_numpy(dtype=np.float64),
+                out,
+            )
+            indicators = pd.DataFrame(out, index=df.index, columns=list(_KERNEL_COLUMNS), copy=False)
+        else:
+            macd = MACD(close=close, window_fast=12, window_slow=26, window_sign=9)
+            bb = BollingerBands(close=close, window=20, window_dev=2)
+            indicators = pd.DataFrame(
+                {
+                    "ema_12": EMAIndicator(close=close, window=12).ema_indicator(),
+                    "ema_26": EMAIndicator(close=close, window=26).ema_indicator(),
+                    "sma_50": SMAIndicator(close=close, window=50).sma_indicator(),
+                    "sma_200": SMAIndicator(close=close, window=200).sma_indicator(),
+                    "macd": macd.macd(),
+                    "macd_signal": macd.macd_signal(),
+                    "rsi": RSIIndicator(close=close, window=14).rsi(),
+                    "stoch_k": StochasticOscillator(
+                        high=high, low=low, close=close, window=14, smooth_window=3
+                    ).stoch(),
+                    "adx": ADXIndicator(high=high, low=low, close=close, window=14).adx(),
+                    "bb_upper": bb.bollinger_hband(),
+                    "bb_lower": bb.bollinger_lband(),
+                    "bb_middle": bb.bollinger_mavg(),
+                    "atr": AverageTrueRange(high=high, low=low, close=close, window=14).average_true_range(),
+                },
+                index=df.index,
+            )
+            volume = df["volume"].replace(0, np.nan).fillna(method="ffill")
+            indicators["volume_ratio"] = volume / volume.rolling(window=20).mean()
+
+        frame = pd.concat([df, indicators], axis=1, copy=False).iloc[_WARMUP_ROWS:]
+        return frame.dropna(subset=_SPARSE_COLUMNS)
 
+    @staticmethod
     def _score(
-        self,
-        df: pd.DataFrame,
-        trade: Dict[str, Any],
+        last: Dict[str, float],
+        trade: TradePlan,
         timeframe: str,
     ) -> tuple[int, str, str, str, List[str]]:
-        rsi = df["rsi"].iloc[-1]
-        macd = df["macd"].iloc[-1]
-        macd_signal = df["macd_signal"].iloc[-1]
-        adx = df["adx"].iloc[-1]
-        ema_fast = df["ema_12"].iloc[-1]
-        ema_slow = df["ema_26"].iloc[-1]
-        sma_50 = df["sma_50"].iloc[-1]
-        close = df["close"].iloc[-1]
-        bb_upper = df["bb_upper"].iloc[-1]
-        bb_lower = df["bb_lower"].iloc[-1]
+        rsi = last["rsi"]
+        macd = last["macd"]
+        macd_signal = last["macd_signal"]
+        adx = last["adx"]
+        ema_fast = last["ema_12"]
+        ema_slow = last["ema_26"]
+        sma_50 = last["sma_50"]
+        close = last["close"]
+        bb_upper = last["bb_upper"]
+        bb_lower = last["bb_lower"]
 
         score = 0
-        reasons: List[str] = []
+        codes: List[int] = []
 
         if ema_fast > ema_slow:
             score += 3
-            reasons.append("✅ Fast EMA trending above slow EMA.")
+            codes.append(_R_EMA_UP)
         else:
             score -= 3
-            reasons.append("❌ Fast EMA below slow EMA.")
+            codes.append(_R_EMA_DOWN)
 
         if close > sma_50:
             score += 2
-            reasons.append("✅ Price trading above 50 SMA.")
+            codes.append(_R_ABOVE_SMA50)
         else:
             score -= 2
-            reasons.append("❌ Price below 50 SMA.")
+            codes.append(_R_BELOW_SMA50)
 
         if macd > macd_signal:
             score += 2
-            reasons.append("✅ MACD line above signal line.")
+            codes.append(_R_MACD_UP)
         else:
             score -= 2
-            reasons.append("❌ MACD line below signal line.")
+            codes.append(_R_MACD_DOWN)
 
         if 40 <= rsi <= 60:
-            reasons.append("⚠️ RSI in neutral zone.")
+            codes.append(_R_RSI_NEUTRAL)
         elif rsi > 60:
             score += 2
-            reasons.append("✅ RSI momentum bullish.")
+            codes.append(_R_RSI_BULL)
         else:
             score -= 2
-            reasons.append("❌ RSI momentum bearish.")
+            codes.append(_R_RSI_BEAR)
 
         if adx > 25:
             score += 1
-            reasons.append("✅ Trend strength (ADX) above 25.")
+            codes.append(_R_ADX_STRONG)
 
         if bb_lower < close < bb_upper:
-            reasons.append("✅ Price inside Bollinger bands.")
+            codes.append(_R_INSIDE_BB)
         else:
             score -= 1
-            reasons.append("⚠️ Price outside Bollinger bands.")
+            codes.append(_R_OUTSIDE_BB)
 
-        if trade["risk_reward_ratio"] and trade["risk_reward_ratio"] >= 1.5:
+        if trade.risk_reward_ratio and trade.risk_reward_ratio >= 1.5:
             score += 2
-            reasons.append("✅ Attractive risk-reward profile.")
+            codes.append(_R_RR_GOOD)
         else:
             score -= 1
-            reasons.append("⚠️ Risk-reward below ideal threshold.")
+            codes.append(_R_RR_POOR)
 
-        recommendation, action, confidence = self._recommendation_from_score(score, timeframe)
-        return score, recommendation, action, confidence, reasons
+        recommendation, action, confidence = SilverPositionEngine._recommendation_from_score(score, timeframe)
+        return score, recommendation, action, confidence, [_REASONS[code] for code in codes]
 
     @staticmethod
     def _recommendation_from_score(score: int, timeframe: str) -> tuple[str, str, str]:
-        if score >= 8:
-            return "🟢 STRONG BUY", "BUY", "High"
-        if score >= 5:
-            return "🟢 BUY", "BUY", "Medium"
-        if score >= 2:
-            return "🟡 WEAK BUY", "BUY", "Medium"
-        if -2 <= score <= 1:
-            return "⚪ HOLD / WAIT", "HOLD", "Balanced"
-        if score <= -8:
-            return "🔴 STRONG SELL", "SELL", "High"
-        if score <= -5:
-            return "🔴 SELL", "SELL", "Medium"
-        return "🟠 WEAK SELL", "SELL", "Medium"
+        return _SCORE_LABELS[bisect_right(_SCORE_THRESHOLDS, score)]
 
     @staticmethod
     def _risk_reward_pct(
         current_price: float,
-        trade: Dict[str, Optional[float]],
+        trade: TradePlan,
     ) -> tuple[float, float]:
         risk_pct = 0.0
         reward_pct = 0.0
-        if trade["stop_loss"]:
-            risk_pct = ((current_price - trade["stop_loss"]) / current_price) * 100
-        if trade["take_profit_2"]:
-            reward_pct = ((trade["take_profit_2"] - current_price) / current_price) * 100
+        if trade.stop_loss:
+            risk_pct = ((current_price - trade.stop_loss) / current_price) * 100
+        if trade.take_profit_2:
+            reward_pct = ((trade.take_profit_2 - current_price) / current_price) * 100
         return round(risk_pct, 2), round(reward_pct, 2)
 
     @staticmethod
-    def _indicator_snapshot(df: pd.DataFrame) -> Dict[str, float]:
-        latest = df.iloc[-1]
-        return {
-            "ema_12": float(latest["ema_12"]),
-            "ema_26": float(latest["ema_26"]),
-            "sma_50": float(latest["sma_50"]),
-            "sma_200": float(latest.get("sma_200")),
-            "rsi": float(latest["rsi"]),
-            "macd": float(latest["macd"]),
-            "macd_signal": float(latest["macd_signal"]),
-            "stoch_k": float(latest["stoch_k"]),
-            "bb_upper": float(latest["bb_upper"]),
-            "bb_middle": float(latest["bb_middle"]),
-            "bb_lower": float(latest["bb_lower"]),
-            "atr": float(latest["atr"]),
-            "trend": 1 if classify_trend(df) == "bullish" else -1,
-            "adx": float(latest["adx"]),
-            "volume_ratio": float(latest["volume_ratio"]),
-        }
+    def _indicator_snapshot(last: Dict[str, float], trend: str) -> Dict[str, float]:
+        snapshot = {name: last[name] for name in _SNAPSHOT_COLUMNS}
+        snapshot["trend"] = 1 if trend == "bullish" else -1
+        return snapshot
 
     @staticmethod
-    def _technical_details(df: pd.DataFrame) -> List[str]:
-        latest = df.iloc[-1]
-        prev = df.iloc[-2]
+    def _technical_details(last: Dict[str, float], prev: Dict[str, float]) -> List[str]:
         return [
-            f"EMA12/EMA26 spread: {latest['ema_12'] - latest['ema_26']:.3f}",
-            f"RSI last two candles: {prev['rsi']:.1f} → {latest['rsi']:.1f}",
-            f"MACD histogram: {(latest['macd'] - latest['macd_signal']):.3f}",
-            f"ATR (volatility): {latest['atr']:.3f}",
-            f"Volume ratio vs 20 SMA: {latest['volume_ratio']:.2f}x",
+            f"EMA12/EMA26 spread: {last['ema_12'] - last['ema_26']:.3f}",
+            f"RSI last two candles: {prev['rsi']:.1f} → {last['rsi']:.1f}",
+            f"MACD histogram: {(last['macd'] - last['macd_signal']):.3f}",
+            f"ATR (volatility): {last['atr']:.3f}",
+            f"Volume ratio vs 20 SMA: {last['volume_ratio']:.2f}x",
         ]
 
+    @staticmethod
+    def _isoformat_index(index: pd.DatetimeIndex) -> List[str]:
+        """`Timestamp.isoformat()` for every entry, formatted in one NumPy call where it can be"""
+        if index.tz is None:
+            fraction = index.asi8 % 1_000_000_000
+            # isoformat drops a zero fraction and prints microseconds otherwise
+            if not fraction.any():
+                return np.datetime_as_string(index.to_numpy(dtype="datetime64[s]"), unit="s").tolist()
+            if fraction.all() and not (fraction % 1_000).any():
+                return np.datetime_as_string(index.to_numpy(dtype="datetime64[us]"), unit="us").tolist()
+        return [stamp.isoformat() for stamp in index]
+
     @staticmethod
     def _chart_payload(df: pd.DataFrame, limit: int = 150) -> Dict[str, List[Any]]:
         tail = df.iloc[-limit:]
-        timestamps = [idx.isoformat() for idx in tail.index]
-        return {
-            "timestamps": timestamps,
-            "close": tail["close"].round(3).tolist(),
-            "high": tail["high"].round(3).tolist(),
-            "low": tail["low"].round(3).tolist(),
-            "volume": tail["volume"].round(3).tolist(),
-            "ema_12": tail["ema_12"].round(3).tolist(),
-            "ema_26": tail["ema_26"].round(3).tolist(),
-            "sma_50": tail["sma_50"].round(3).tolist(),
-            "bb_upper": tail["bb_upper"].round(3).tolist(),
-            "bb_lower": tail["bb_lower"].round(3).tolist(),
-        }
+        timestamps = SilverPositionEngine._isoformat_index(tail.index)
+        # Round all series in one array and convert column by column
+        values = np.round(tail[list(_CHART_COLUMNS)].to_numpy(dtype=np.float64), 3)
+        payload: Dict[str, List[Any]] = {"timestamps": timestamps}
+        for col, name in enumerate(_CHART_COLUMNS):
+            payload[name] = values[:, col].tolist()
+        return payload
 
     @staticmethod
     def _classify_sentiment(rsi: float) -> str:
-        if rsi >= 70:
-            return "Extreme Greed"
-        if rsi >= 60:
-            return "Greed"
-        if rsi <= 30:
-            return "Extreme Fear"
-        if rsi <= 40:
-            return "Fear"
-        return "Neutral"
+        return _SENTIMENT_LABELS[bisect_right(_SENTIMENT_THRESHOLDS, rsi)]
 
 
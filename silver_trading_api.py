@@ -9,11 +9,12 @@ from datetime import datetime, timezone
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from claude_summary import ClaudeSummaryService
@@ -29,7 +30,7 @@ settings = get_settings()
 app = FastAPI(
     title="Iliicheto Silver Fetch",
     version="0.1.0",
-    default_response_class=JSONResponse,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -47,7 +48,7 @@ app.add_middleware(
 
 # Services
 market_service = SilverMarketDataService()
-engine = SilverPositionEngine(market_service)
+engine = SilverPositionEngine(market_service, workers=settings.analysis_workers)
 claude = ClaudeSummaryService(settings.claude)
 
 
@@ -55,7 +56,7 @@ class MarketState:
     def __init__(self) -> None:
         self.positions: List[Dict[str, Any]] = []
         self.spot_prices: Dict[str, Any] = {}
-        self.summary: Dict[str, Any] | None = None
+        self.summary: Mapping[str, Any] | None = None
         self.last_update: Optional[str] = None
 
 
@@ -77,15 +78,21 @@ class ConnectionManager:
         logger.info("Client disconnected (%s total)", len(self.active_connections))
 
     async def broadcast(self, payload: Dict[str, Any]) -> None:
-        dead: List[WebSocket] = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(payload)
-            except Exception as exc:  # noqa: BLE001
-                logger.error("WebSocket broadcast failure: %s", exc)
-                dead.append(connection)
-        for connection in dead:
-            self.disconnect(connection)
+        # Serialize once for all clients; orjson handles numpy values natively.
+        # Sent as text frames because the frontend JSON.parses event.data.
+        message = orjson.dumps(
+            payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        ).decode()
+        connections = list(self.active_connections)
+        # Send concurrently so one slow client does not hold up the rest
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error("WebSocket broadcast failure: %s", result)
+                self.disconnect(connection)
 
 
 manager = ConnectionManager()
@@ -94,13 +101,21 @@ manager = ConnectionManager()
 async def refresh_state() -> None:
     try:
         logger.info("Refreshing silver market state...")
-        positions_task = asyncio.create_task(engine.analyze_all())
-        spot_task = asyncio.create_task(market_service.fetch_spot_prices())
-        intraday_task = asyncio.create_task(market_service.get_intraday_snapshot())
-
-        positions = await positions_task
-        spot_prices = await spot_task
-        intraday = await intraday_task
+        positions, spot_prices, intraday = await asyncio.gather(
+            engine.analyze_all(),
+            market_service.fetch_spot_prices(),
+            market_service.get_intraday_snapshot(),
+            return_exceptions=True,
+        )
+        if isinstance(positions, BaseException):
+            logger.error("Position analysis failed: %s", positions)
+            positions = state.positions
+        if isinstance(spot_prices, BaseException):
+            logger.error("Spot price fetch failed: %s", spot_prices)
+            spot_prices = dict(state.spot_prices)
+        if isinstance(intraday, BaseException):
+            logger.error("Intraday snapshot failed: %s", intraday)
+            intraday = {}
         spot_prices["intraday"] = intraday
 
         state.positions = positions
@@ -151,67 +166,36 @@ async def refresh_state() -> None:
 
 
 async def refresh_loop() -> None:
-    # Initial refresh - don't block if it fails
-    try:
-        await refresh_state()
-        await manager.broadcast(
-            {
-                "type": "update",
-                "timestamp": state.last_update,
-                "positions": _convert_numpy_types(state.positions),
-                "current_price": state.spot_prices.get("average"),
-                "spot_prices": _convert_numpy_types(state.spot_prices),
-                "summary": _convert_numpy_types(state.summary),
-                "fear_greed": _convert_numpy_types(_derive_sentiment()),
-            }
-        )
-    except Exception as exc:
-        logger.error("Initial refresh failed (will retry): %s", exc, exc_info=True)
-    
-    # Continuous refresh loop
     while True:
         try:
             await refresh_state()
-            await manager.broadcast(
-                {
-                    "type": "update",
-                    "timestamp": state.last_update,
-                    "positions": _convert_numpy_types(state.positions),
-                    "current_price": state.spot_prices.get("average"),
-                    "spot_prices": _convert_numpy_types(state.spot_prices),
-                    "summary": _convert_numpy_types(state.summary),
-                    "fear_greed": _convert_numpy_types(_derive_sentiment()),
-                }
-            )
+            await manager.broadcast(_build_broadcast_payload())
         except Exception as exc:  # noqa: BLE001
             logger.exception("Background refresh failed: %s", exc)
         await asyncio.sleep(settings.refresh_seconds)
 
 
+def _build_broadcast_payload() -> Dict[str, Any]:
+    return {
+        "type": "update",
+        "timestamp": state.last_update,
+        "positions": state.positions,
+        "current_price": state.spot_prices.get("average"),
+        "spot_prices": state.spot_prices,
+        "summary": _summary_payload(),
+        "fear_greed": _derive_sentiment(),
+    }
+
+
 def _best_position(positions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if not positions:
         return None
     return max(positions, key=lambda p: p.get("score", 0))
 
 
-def _convert_numpy_types(obj: Any) -> Any:
-    """Convert numpy types to Python native types for JSON serialization"""
-    import numpy as np
-    
-    if isinstance(obj, dict):
-        return {key: _convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    else:
-        return obj
+def _summary_payload() -> Optional[Dict[str, Any]]:
+    # The placeholder summary is a read-only mapping, which orjson does not serialize
+    return dict(state.summary) if state.summary is not None else None
 
 
 @app.on_event("startup")
@@ -245,31 +229,40 @@ async def on_startup() -> None:
         asyncio.create_task(refresh_loop())
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await market_service.aclose()
+    engine.shutdown()
+
+
 @app.get("/api/positions")
 async def get_positions() -> Any:
-    return {
-        "success": True,
-        "timestamp": state.last_update,
-        "positions": _convert_numpy_types(state.positions),
-        "count": len(state.positions),
-    }
+    # Returned as a response so FastAPI skips its jsonable_encoder walk
+    return ORJSONResponse(
+        {
+            "success": True,
+            "timestamp": state.last_update,
+            "positions": state.positions,
+            "count": len(state.positions),
+        }
+    )
 
 
 @app.get("/api/current-price")
 async def get_current_price() -> Any:
-    return {
-        "success": True,
-        "timestamp": state.last_update,
-        "prices": _convert_numpy_types(state.spot_prices),
-    }
+    return ORJSONResponse(
+        {
+            "success": True,
+            "timestamp": state.last_update,
+            "prices": state.spot_prices,
+        }
+    )
 
 
 @app.get("/api/fear-greed")
 async def get_fear_greed() -> Any:
     try:
         sentiment = _derive_sentiment()
-        # Convert numpy types to native Python types
-        sentiment = _convert_numpy_types(sentiment)
         return {
             "success": True,
             "timestamp": state.last_update or datetime.now(timezone.utc).isoformat(),
@@ -305,11 +298,13 @@ def _derive_sentiment() -> Dict[str, Any]:
 
 @app.get("/api/summary")
 async def get_summary() -> Any:
-    return {
-        "success": True,
-        "timestamp": state.last_update,
-        "summary": _convert_numpy_types(state.summary),
-    }
+    return ORJSONResponse(
+        {
+            "success": True,
+            "timestamp": state.last_update,
+            "summary": _summary_payload(),
+        }
+    )
 
 
 @app.get("/api/health")
@@ -329,9 +324,13 @@ async def health() -> Any:
 async def websocket_endpoint(websocket: WebSocket) -> None:
     await manager.connect(websocket)
     try:
-        while True:
-            await asyncio.sleep(5)
+        # Broadcasts are the only writes; block on the socket so a disconnect
+        # is seen as soon as it happens instead of on a polling timer
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
@@ -401,12 +400,15 @@ if __name__ == "__main__":
 
     port = int(os.getenv("PORT", "8342"))
     host = os.getenv("HOST", "0.0.0.0")
+    # Auto-reload is a development convenience; opt in with RELOAD=true
+    reload = os.getenv("RELOAD", "false").lower() == "true"
 
     logger.info(f"🚀 Starting Iliicheto Silver Fetch server on {host}:{port}")
     uvicorn.run(
-        app,
+        "silver_trading_api:app",
         host=host,
         port=port,
         log_level="info",
-        reload=True,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=reload,
     )
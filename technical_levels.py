@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 
 
@@ -11,50 +12,67 @@ class LevelSet:
     resistances: list[float]
 
 
-def detect_levels(df: pd.DataFrame, lookback: int = 35, limit: int = 4) -> LevelSet:
-    highs = df["high"]
-    lows = df["low"]
-    supports: list[float] = []
-    resistances: list[float] = []
+@dataclass(frozen=True, slots=True)
+class TradePlan:
+    entry: float
+    stop_loss: float | None
+    take_profit_1: float | None
+    take_profit_2: float | None
+    risk_reward_ratio: float | None
 
-    for i in range(lookback, len(df) - lookback):
-        window_high = highs[i - lookback : i + lookback]
-        window_low = lows[i - lookback : i + lookback]
 
-        pivot_high = window_high.max()
-        pivot_low = window_low.min()
+def detect_levels(
+    df: pd.DataFrame, lookback: int = 35, limit: int = 4, tolerance: float = 0.2
+) -> LevelSet:
+    highs = df["high"].to_numpy(dtype=np.float64)
+    lows = df["low"].to_numpy(dtype=np.float64)
+    supports = np.empty(0)
+    resistances = np.empty(0)
 
-        if highs[i] == pivot_high and _is_unique_level(pivot_high, resistances):
-            resistances.append(float(pivot_high))
+    # Window for bar i spans [i - lookback, i + lookback); bars lookback .. n - lookback - 1
+    count = len(df) - 2 * lookback
+    if count > 0:
+        window = 2 * lookback
+        pivot_highs = sliding_window_view(highs, window)[:count].max(axis=1)
+        pivot_lows = sliding_window_view(lows, window)[:count].min(axis=1)
+        resistances = _dedupe_levels(pivot_highs[highs[lookback : lookback + count] == pivot_highs], tolerance)
+        supports = _dedupe_levels(pivot_lows[lows[lookback : lookback + count] == pivot_lows], tolerance)
 
-        if lows[i] == pivot_low and _is_unique_level(pivot_low, supports):
-            supports.append(float(pivot_low))
+    return LevelSet(
+        supports=supports[-limit:].tolist(),
+        resistances=resistances[:limit].tolist(),
+    )
 
-        if len(supports) >= limit and len(resistances) >= limit:
-            break
 
-    supports = sorted(supports)[-limit:]
-    resistances = sorted(resistances)[:limit]
-    return LevelSet(supports=supports, resistances=resistances)
-
-
-def _is_unique_level(value: float, levels: list[float], tolerance: float = 0.2) -> bool:
-    return all(abs(level - value) > tolerance for level in levels)
+def _dedupe_levels(values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Sorted levels with each run of values closer than `tolerance` collapsed to its lowest member."""
+    levels = np.sort(values)
+    if levels.size == 0:
+        return levels
+    keep = np.concatenate(([True], np.diff(levels) > tolerance))
+    return levels[keep]
 
 
 def classify_trend(df: pd.DataFrame) -> str:
-    close = df["close"]
-    ema_fast = close.ewm(span=21).mean()
-    ema_slow = close.ewm(span=55).mean()
+    close = df["close"].to_numpy(dtype=np.float64)
+    ema_fast = _final_ema(close, span=21)
+    ema_slow = _final_ema(close, span=55)
 
-    if ema_fast.iloc[-1] > ema_slow.iloc[-1] * 1.002:
+    if ema_fast > ema_slow * 1.002:
         return "bullish"
-    if ema_fast.iloc[-1] < ema_slow.iloc[-1] * 0.998:
+    if ema_fast < ema_slow * 0.998:
         return "bearish"
     return "neutral"
 
 
-def build_trade_plan(current_price: float, levels: LevelSet) -> dict[str, float | None]:
+def _final_ema(values: np.ndarray, span: int) -> float:
+    """Last value of pandas' ``ewm(span=span).mean()`` (adjust=True) without building the series."""
+    decay = 1.0 - 2.0 / (span + 1)
+    weights = decay ** np.arange(len(values) - 1, -1, -1, dtype=np.float64)
+    return float(weights @ values / weights.sum())
+
+
+def build_trade_plan(current_price: float, levels: LevelSet) -> TradePlan:
     entry = current_price
 
     stop_loss = None
@@ -75,12 +93,12 @@ def build_trade_plan(current_price: float, levels: LevelSet) -> dict[str, float
         if risk:
             rr = reward / risk
 
-    return {
-        "entry": entry,
-        "stop_loss": stop_loss,
-        "take_profit_1": take_profit_1,
-        "take_profit_2": take_profit_2,
-        "risk_reward_ratio": rr,
-    }
+    return TradePlan(
+        entry=entry,
+        stop_loss=stop_loss,
+        take_profit_1=take_profit_1,
+        take_profit_2=take_profit_2,
+        risk_reward_ratio=rr,
+    )
 
 
@@ -11,6 +11,7 @@ async def main():
         print(f"📊 Average price: ${result['average']:.2f}")
     for source in result.get('sources', []):
         print(f"  • {source['source']}: ${source['price']:.2f}")
+    await service.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())